@@ -42,26 +42,28 @@ def steepest_gradient_descent(num_samples,
     num_samples : int
         Number of samples to get from the sampler.
 
-    linear_biases : list(float)
+    linear_biases : list(float) or numpy.ndarray
         The linear biases or field values for the problem.
 
-    coupler_starts : list(int)
+    coupler_starts : list(int) or numpy.ndarray
         A list of the start variable of each coupler. For a problem
         with the couplers (0, 1), (1, 2), and (3, 1), `coupler_starts`
         should be [0, 1, 3].
 
-    coupler_ends : list(int)
+    coupler_ends : list(int) or numpy.ndarray
         A list of the end variable of each coupler. For a problem
         with the couplers (0, 1), (1, 2), and (3, 1), `coupler_ends`
         should be [1, 2, 1].
 
-    coupler_weights : list(float)
+    coupler_weights : list(float) or numpy.ndarray
         A list of the J values or weight on each coupler, in the same
         order as `coupler_starts` and `coupler_ends`.
 
     states_numpy : np.ndarray[char, ndim=2, mode="c"], values in (-1, 1)
         The initial seeded states of the gradient descent runs. Should be of
-        a contiguous numpy.ndarray of shape (num_samples, num_variables).
+        a contiguous numpy.ndarray of shape (num_samples, num_variables) and
+        dtype numpy.int8. States are descended in place, and for non-empty
+        problems the same array is returned as `samples`.
 
     large_sparse_opt : bool
         When set to True, large-and-sparse problem graph optimizations are used.
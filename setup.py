@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
+
 from setuptools import setup
 from Cython.Build import cythonize
 from setuptools.command.build_ext import build_ext
@@ -57,6 +59,9 @@ setup(
          'dwave/samplers/tabu/tabu_search.pyx',
          'dwave/samplers/tree/*.pyx',
          ],
+        # only modules with changed .pyx/.pxd dependencies are re-cythonized,
+        # optionally in parallel
+        nthreads=int(os.getenv('CYTHON_NTHREADS', 0)),
         ),
     include_dirs=[
         dimod.get_include(),
@@ -45,6 +45,27 @@ class SteepestGradientDescentCython(unittest.TestCase):
         np.testing.assert_array_equal(samples, [[-1, -1]])
         np.testing.assert_array_equal(energies, [-5])
 
+        # int8 initial states are descended in place, without a copy
+        self.assertIs(samples, initial_states)
+        self.assertEqual(samples.dtype, np.int8)
+
+    def test_steepest_gradient_descent_on_numpy_vectors(self):
+        """Biases and couplers are accepted as numpy arrays, as produced by
+        `BinaryQuadraticModel.to_numpy_vectors`."""
+
+        bqm = dimod.BQM.from_ising({0: 2, 1: 2}, {(0, 1): -1})
+        linear_biases, (coupler_starts, coupler_ends, coupler_weights), _ = \
+            bqm.to_numpy_vectors(variable_order=[0, 1])
+        initial_states = np.array([[1, 1]], dtype=np.int8)
+
+        samples, energies, num_steps = steepest_gradient_descent(
+            1, linear_biases, coupler_starts, coupler_ends,
+            coupler_weights, initial_states, self.large_sparse_opt)
+
+        np.testing.assert_array_equal(samples, [[-1, -1]])
+        np.testing.assert_array_equal(energies, [-5])
+        np.testing.assert_array_equal(num_steps, [2])
+
 
 class SteepestGradientDescentLargeSparseCython(SteepestGradientDescentCython):
     large_sparse_opt = True
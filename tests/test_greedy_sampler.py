@@ -15,7 +15,7 @@
 import unittest
 
 import numpy as np
-from parameterized import parameterized, parameterized_class
+from parameterized import parameterized
 
 import dimod
 from dimod.testing.sampler import BQM_SUBCLASSES
@@ -25,70 +25,89 @@ from dwave.samplers.greedy.sampler import SteepestDescentSampler
 
 BQM_CLASSES = [(cls, ) for cls in BQM_SUBCLASSES]
 
+# vary large & sparse problem optimization via sampling params, only for the
+# tests that actually exercise the descent. Tests with many reads run them on
+# `dimod.BQM` only, and loop over the BQM subclasses with a cheap few-read
+# check, as the descent work does not depend on the subclass.
+LARGE_SPARSE_OPT = [(False, ), (True, )]
+BQM_CLASSES_LARGE_SPARSE_OPT = [
+    (cls, large_sparse_opt)
+    for cls in BQM_SUBCLASSES for large_sparse_opt in (False, True)]
+
+
+class LargeSparseSteepestDescentSampler(SteepestDescentSampler):
+    """Steepest descent sampler that defaults to ``large_sparse_opt=True``,
+    so that dimod's generic sampler tests also cover that mode."""
+
+    def sample(self, bqm, large_sparse_opt=True, **kwargs):
+        return super().sample(bqm, large_sparse_opt=large_sparse_opt, **kwargs)
+
 
-@parameterized_class([
-    # vary large & sparse problem optimization via sampling params
-    {"params": dict(large_sparse_opt=False)},
-    {"params": dict(large_sparse_opt=True)},
-])
 @dimod.testing.load_sampler_bqm_tests(SteepestDescentSampler)
+@dimod.testing.load_sampler_bqm_tests(LargeSparseSteepestDescentSampler)
 class TestSteepestDescentSampler(unittest.TestCase):
 
+    @classmethod
+    def setUpClass(cls):
+        cls.sampler = SteepestDescentSampler()
+
     def test_instantiation(self):
         """The sampler must conform to `dimod.Sampler` interface."""
 
         sampler = SteepestDescentSampler()
         dimod.testing.assert_sampler_api(sampler)
 
-    @parameterized.expand(BQM_CLASSES)
-    def test_edges(self, BQM):
+    @parameterized.expand(BQM_CLASSES_LARGE_SPARSE_OPT)
+    def test_edges(self, BQM, large_sparse_opt):
         """The sampler correctly handles edge cases."""
 
-        sampler = SteepestDescentSampler()
+        sampler = self.sampler
 
         # empty bqm
-        ss = sampler.sample(BQM.empty('SPIN'), **self.params)
+        ss = sampler.sample(BQM.empty('SPIN'), large_sparse_opt=large_sparse_opt)
         self.assertEqual(ss.first.sample, {})
 
         # single-variable problem
-        ss = sampler.sample(BQM.from_ising({'x': 1}, {}), **self.params)
+        ss = sampler.sample(BQM.from_ising({'x': 1}, {}),
+                            large_sparse_opt=large_sparse_opt)
         self.assertEqual(ss.first.sample, {'x': -1})
 
     @parameterized.expand(BQM_CLASSES)
     def test_validation(self, BQM):
         """Inputs are validated."""
 
-        sampler = SteepestDescentSampler()
+        sampler = self.sampler
         empty = BQM.from_ising({}, {})
         bqm = BQM.from_ising({'x': 1}, {})
 
         with self.assertRaises(TypeError):
-            sampler.sample(bqm, num_reads=2.3, **self.params)
+            sampler.sample(bqm, num_reads=2.3)
 
         with self.assertRaises(ValueError):
-            sampler.sample(bqm, num_reads=0, **self.params)
+            sampler.sample(bqm, num_reads=0)
 
         with self.assertRaises(ValueError):
-            sampler.sample(bqm, initial_states=(), **self.params)
+            sampler.sample(bqm, initial_states=())
 
         with self.assertRaises(TypeError):
-            sampler.sample(bqm, seed=2.3, **self.params)
+            sampler.sample(bqm, seed=2.3)
 
         with self.assertRaises(ValueError):
-            sampler.sample(bqm, seed=-1, **self.params)
+            sampler.sample(bqm, seed=-1)
 
         with self.assertRaises(ValueError):
-            sampler.sample(bqm, initial_states_generator='invalid', **self.params)
+            sampler.sample(bqm, initial_states_generator='invalid')
 
         init = dimod.SampleSet.from_samples({'y': 1}, vartype='SPIN', energy=0)
         with self.assertRaises(ValueError):
-            sampler.sample(bqm, initial_states=init, **self.params)
+            sampler.sample(bqm, initial_states=init)
 
         init = dimod.SampleSet.from_samples({0: 1}, vartype='SPIN', energy=0)
         with self.assertRaises(ValueError):
-            sampler.sample(empty, initial_states=init, **self.params)
+            sampler.sample(empty, initial_states=init)
 
-    def test_small_convex_ising(self):
+    @parameterized.expand(LARGE_SPARSE_OPT)
+    def test_small_convex_ising(self, large_sparse_opt):
         """The sampler must converge to a global minimum of a convex Ising problem."""
 
         # a convex section of hyperbolic paraboloid in the Ising space,
@@ -96,81 +115,99 @@ class TestSteepestDescentSampler(unittest.TestCase):
         h = {0: 2, 1: 2}
         J = {(0, 1): -1}
 
-        ss = SteepestDescentSampler().sample_ising(h, J, **self.params)
+        ss = self.sampler.sample_ising(h, J, large_sparse_opt=large_sparse_opt)
 
         self.assertEqual(len(ss), 1)
         self.assertEqual(len(ss.variables), 2)
         self.assertEqual(ss.record.sample.shape, (1, 2))
         np.testing.assert_array_equal(ss.record.sample[0], [-1, -1])
 
-    def test_small_convex_qubo(self):
+    @parameterized.expand(LARGE_SPARSE_OPT)
+    def test_small_convex_qubo(self, large_sparse_opt):
         """The sampler must converge to a global minimum of a convex QUBO problem."""
 
         # a convex section of hyperbolic paraboloid in the QUBO space,
         # with global minimum at (0,0)
         Q = {(0, 0): 2, (1, 1): 2, (0, 1): -1}
 
-        ss = SteepestDescentSampler().sample_qubo(Q, **self.params)
+        ss = self.sampler.sample_qubo(Q, large_sparse_opt=large_sparse_opt)
 
         self.assertEqual(len(ss), 1)
         self.assertEqual(len(ss.variables), 2)
         self.assertEqual(ss.record.sample.shape, (1, 2))
         np.testing.assert_array_equal(ss.record.sample[0], [0, 0])
 
-    @parameterized.expand(BQM_CLASSES)
-    def test_variable_relabeling(self, BQM):
+    @parameterized.expand(BQM_CLASSES_LARGE_SPARSE_OPT)
+    def test_variable_relabeling(self, BQM, large_sparse_opt):
         """The sampler must accept non-integer/sequential variable names."""
 
         # use a small convex bqm
         bqm = BQM.from_ising({'x': 2, 'y': 2}, {'xy': -1})
 
-        ss = SteepestDescentSampler().sample(bqm, **self.params)
+        ss = self.sampler.sample(bqm, large_sparse_opt=large_sparse_opt)
 
         self.assertSetEqual(set(ss.variables), set(bqm.variables))
         self.assertDictEqual(ss.first.sample, {'x': -1, 'y': -1})
 
-    @parameterized.expand(BQM_CLASSES)
-    def test_unsortable_labels(self, BQM):
+    @parameterized.expand(BQM_CLASSES_LARGE_SPARSE_OPT)
+    def test_unsortable_labels(self, BQM, large_sparse_opt):
         """The sampler must accept unorderable variable names."""
 
         # use a small convex bqm
         bqm = BQM.from_ising({0: 2, 'a': 2}, {(0, 'a'): -1})
 
-        ss = SteepestDescentSampler().sample(bqm, **self.params)
+        ss = self.sampler.sample(bqm, large_sparse_opt=large_sparse_opt)
 
         self.assertSetEqual(set(ss.variables), set(bqm.variables))
         self.assertEqual(ss.first.energy, -5)
 
-    @parameterized.expand(BQM_CLASSES)
-    def test_reproducible_convergence(self, BQM):
+    @parameterized.expand(LARGE_SPARSE_OPT)
+    def test_reproducible_convergence(self, large_sparse_opt):
         """On a convex problem, all samples must correspond to the global minimum."""
 
         # a convex section of hyperbolic paraboloid in the Ising space,
         # with global minimum at (-1,-1)
-        bqm = BQM.from_ising({0: 2, 1: 2}, {(0, 1): -1})
+        for BQM in BQM_SUBCLASSES:
+            with self.subTest(BQM=BQM):
+                bqm = BQM.from_ising({0: 2, 1: 2}, {(0, 1): -1})
+                ss = self.sampler.sample(
+                    bqm, num_reads=2, large_sparse_opt=large_sparse_opt)
+                np.testing.assert_array_equal(ss.record.sample, [[-1, -1]]*2)
+
+        bqm = dimod.BQM.from_ising({0: 2, 1: 2}, {(0, 1): -1})
         num_samples = 100
 
         # each sample is derived from a random initial state
-        ss = SteepestDescentSampler().sample(
-            bqm, num_reads=num_samples, **self.params)
-
-        expected = np.tile([-1, -1], (num_samples, 1))
+        ss = self.sampler.sample(
+            bqm, num_reads=num_samples, large_sparse_opt=large_sparse_opt)
 
-        np.testing.assert_array_equal(ss.record.sample, expected)
+        # all reads are descended in a single call, compare against a
+        # broadcast view instead of materializing the tiled expected array
+        self.assertEqual(ss.record.sample.shape, (num_samples, 2))
+        np.testing.assert_array_equal(
+            ss.record.sample, np.broadcast_to([-1, -1], (num_samples, 2)))
 
-    @parameterized.expand(BQM_CLASSES)
-    def test_initial_states_randomization(self, BQM):
+    @parameterized.expand(LARGE_SPARSE_OPT)
+    def test_initial_states_randomization(self, large_sparse_opt):
         """Assuming uniform RNG, samples must follow a bimodal distribution."""
 
         # use a simple centrally symmetric hyperbolic paraboloid with
         # two minima in Ising space: (-1, 1) and (1, -1)
-        bqm = BQM.from_ising({}, {'xy': 1})
+        for BQM in BQM_SUBCLASSES:
+            with self.subTest(BQM=BQM):
+                bqm = BQM.from_ising({}, {'xy': 1})
+                ss = self.sampler.sample(
+                    bqm, num_reads=2, large_sparse_opt=large_sparse_opt)
+                for sample in ss.samples():
+                    self.assertIn(sample, [{'x': -1, 'y': 1}, {'x': 1, 'y': -1}])
+
+        bqm = dimod.BQM.from_ising({}, {'xy': 1})
 
         num = 1000
         tol = 0.10
 
-        ss = SteepestDescentSampler().sample(
-            bqm, num_reads=num, **self.params
+        ss = self.sampler.sample(
+            bqm, num_reads=num, large_sparse_opt=large_sparse_opt
         ).aggregate()
 
         # sanity check: two minima
@@ -182,57 +219,77 @@ class TestSteepestDescentSampler(unittest.TestCase):
         for record in ss.record:
             self.assertTrue(inf < record.num_occurrences < sup)
 
-    @parameterized.expand(BQM_CLASSES)
-    def test_initial_states(self, BQM):
+    @parameterized.expand(LARGE_SPARSE_OPT)
+    def test_initial_states(self, large_sparse_opt):
         """The sampler must deterministically converge from the initial state(s)."""
 
         # use a simple centrally symmetric hyperbolic paraboloid with
         # two minima in Ising space: (-1, 1) and (1, -1)
-        bqm = BQM.from_ising({}, {(0, 1): 1})
-
         initial_states = dimod.SampleSet.from_samples(
             {0: -1, 1: -1}, vartype='SPIN', energy=0)
 
-        # move along 0-dimension from (-1, -1) and settle in a local minimum (1, -1)
-        ss = SteepestDescentSampler().sample(
-            bqm, initial_states=initial_states, **self.params)
+        for BQM in BQM_SUBCLASSES:
+            with self.subTest(BQM=BQM):
+                bqm = BQM.from_ising({}, {(0, 1): 1})
 
-        self.assertEqual(len(ss), 1)
-        self.assertDictEqual(ss.first.sample, {0: 1, 1: -1})
+                # move along 0-dimension from (-1, -1) and settle in a local
+                # minimum (1, -1)
+                ss = self.sampler.sample(
+                    bqm, initial_states=initial_states,
+                    large_sparse_opt=large_sparse_opt)
+
+                self.assertEqual(len(ss), 1)
+                self.assertDictEqual(ss.first.sample, {0: 1, 1: -1})
+
+                # same with the initial state tiled over a few reads
+                ss = self.sampler.sample(
+                    bqm, initial_states=initial_states,
+                    initial_states_generator='tile', num_reads=10,
+                    large_sparse_opt=large_sparse_opt
+                ).aggregate()
+
+                self.assertEqual(len(ss), 1)
+                self.assertDictEqual(ss.first.sample, {0: 1, 1: -1})
+                self.assertEqual(ss.first.num_occurrences, 10)
 
         # repeat this for 1000 samples, with initial state tiled
+        bqm = dimod.BQM.from_ising({}, {(0, 1): 1})
         num_reads = 1000
-        ss = SteepestDescentSampler().sample(
+        ss = self.sampler.sample(
             bqm, initial_states=initial_states,
-            initial_states_generator='tile', num_reads=num_reads, **self.params
+            initial_states_generator='tile', num_reads=num_reads,
+            large_sparse_opt=large_sparse_opt
         ).aggregate()
 
         self.assertEqual(len(ss), 1)
         self.assertDictEqual(ss.first.sample, {0: 1, 1: -1})
         self.assertEqual(ss.first.num_occurrences, num_reads)
 
-    @parameterized.expand(BQM_CLASSES)
-    def test_initial_states_generation_and_validation(self, BQM):
+    @parameterized.expand(BQM_CLASSES_LARGE_SPARSE_OPT)
+    def test_initial_states_generation_and_validation(self, BQM, large_sparse_opt):
         """Initial states are properly validated/expanded with the state generator."""
 
-        sampler = SteepestDescentSampler()
+        sampler = self.sampler
         bqm = BQM.from_ising({'x': 1}, {})
 
         # num_reads inferred from initial_states
         init = dimod.SampleSet.from_samples([{'x': 1}, {'x': -1}],
                                             vartype='SPIN', energy=0)
-        ss = sampler.sample(bqm, initial_states=init, **self.params)
+        ss = sampler.sample(bqm, initial_states=init,
+                            large_sparse_opt=large_sparse_opt)
         self.assertEqual(len(ss), len(init))
 
         # reads truncated with `num_reads`
-        ss = sampler.sample(bqm, initial_states=init, num_reads=1, **self.params)
+        ss = sampler.sample(bqm, initial_states=init, num_reads=1,
+                            large_sparse_opt=large_sparse_opt)
         self.assertEqual(len(ss), 1)
 
         # init states tiled according to `num_reads`
         init = dimod.SampleSet.from_samples({'x': 1}, vartype='SPIN', energy=0)
         ss = sampler.sample(
             bqm, num_reads=10, initial_states=init,
-            initial_states_generator='tile', **self.params)
+            initial_states_generator='tile',
+            large_sparse_opt=large_sparse_opt)
         self.assertEqual(len(ss), 10)
         self.assertEqual(list(ss.aggregate().samples()), [{'x': -1}])
 
@@ -240,14 +297,15 @@ class TestSteepestDescentSampler(unittest.TestCase):
         with self.assertRaises(ValueError):
             sampler.sample(
                 bqm, initial_states=None, initial_states_generator='tile',
-                **self.params)
+                large_sparse_opt=large_sparse_opt)
 
         # tiling truncates
         init = dimod.SampleSet.from_samples([{'x': 1}, {'x': -1}],
                                             vartype='SPIN', energy=0)
         ss = sampler.sample(
             bqm, num_reads=1, initial_states=init,
-            initial_states_generator='tile', **self.params)
+            initial_states_generator='tile',
+            large_sparse_opt=large_sparse_opt)
         self.assertEqual(len(ss), 1)
 
         # none generator works
@@ -255,14 +313,16 @@ class TestSteepestDescentSampler(unittest.TestCase):
                                             vartype='SPIN', energy=0)
         ss = sampler.sample(
             bqm, num_reads=1, initial_states=init,
-            initial_states_generator='none', **self.params)
+            initial_states_generator='none',
+            large_sparse_opt=large_sparse_opt)
         self.assertEqual(len(ss), 1)
 
         # none generator fails
         with self.assertRaises(ValueError):
             sampler.sample(
                 bqm, num_reads=1, initial_states=None,
-                initial_states_generator='none', **self.params)
+                initial_states_generator='none',
+                large_sparse_opt=large_sparse_opt)
 
     @parameterized.expand([
         (([-1, -1], 'ab'), ),
@@ -275,7 +335,7 @@ class TestSteepestDescentSampler(unittest.TestCase):
         # global minimum at (-1,-1)
         bqm = dimod.BQM.from_ising({'a': 2, 'b': 2}, {'ab': -1})
 
-        ss = SteepestDescentSampler().sample(bqm, initial_states=initial_states)
+        ss = self.sampler.sample(bqm, initial_states=initial_states)
 
         # result is identical to initial state, with zero downhill moves
         np.testing.assert_array_equal(ss.record.sample, [[-1, -1]])
@@ -21,9 +21,19 @@ import dimod.testing
 
 from dwave.samplers import RandomSampler
 
+# time limit given as a timedelta, equivalent to .1 seconds
+TIME_LIMIT_DATETIME = datetime.timedelta(milliseconds=100)
+
 
 @dimod.testing.load_sampler_bqm_tests(RandomSampler)
 class TestRandomSampler(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.bqm3 = dimod.BinaryQuadraticModel({0: 0.0, 1: 0.0, 2: 0.0},
+                                              {(0, 1): -1.0, (1, 2): 1.0, (0, 2): 1.0},
+                                              1.0,
+                                              dimod.SPIN)
+
     def test_initialization(self):
         sampler = RandomSampler()
 
@@ -32,10 +42,7 @@ class TestRandomSampler(unittest.TestCase):
         self.assertEqual(sampler.properties, {})
 
     def test_energies(self):
-        bqm = dimod.BinaryQuadraticModel({0: 0.0, 1: 0.0, 2: 0.0},
-                                         {(0, 1): -1.0, (1, 2): 1.0, (0, 2): 1.0},
-                                         1.0,
-                                         dimod.SPIN)
+        bqm = self.bqm3
         sampler = RandomSampler()
         response = sampler.sample(bqm, num_reads=10)
         self.assertEqual(len(response), 10)
@@ -48,50 +55,39 @@ class TestRandomSampler(unittest.TestCase):
             RandomSampler().sample(bqm, a=5, b=2)
 
     def test_time_limit(self):
-        t = time.time()
+        bqm = self.bqm3
 
-        bqm = dimod.BinaryQuadraticModel({0: 0.0, 1: 0.0, 2: 0.0},
-                                         {(0, 1): -1.0, (1, 2): 1.0, (0, 2): 1.0},
-                                         1.0,
-                                         dimod.SPIN)
-
-        t = time.perf_counter()
+        t = time.perf_counter_ns()
         sampleset = RandomSampler().sample(bqm, time_limit=.02, max_num_samples=10)
-        runtime = time.perf_counter() - t
+        runtime_ns = time.perf_counter_ns() - t
 
-        self.assertTrue(.01 < runtime < .04)
+        self.assertTrue(10_000_000 < runtime_ns < 40_000_000)
 
         dimod.testing.assert_sampleset_energies(sampleset, bqm)
         self.assertEqual(len(sampleset), 10)
         self.assertGreater(sampleset.info['num_reads'], 10)  # should be much much bigger
 
     def test_time_limit_datetime(self):
-        t = time.time()
-
-        bqm = dimod.BinaryQuadraticModel({0: 0.0, 1: 0.0, 2: 0.0},
-                                         {(0, 1): -1.0, (1, 2): 1.0, (0, 2): 1.0},
-                                         1.0,
-                                         dimod.SPIN)
+        bqm = self.bqm3
 
-        t = time.perf_counter()
+        t = time.perf_counter_ns()
         sampleset = RandomSampler().sample(
-            bqm, time_limit=datetime.timedelta(minutes=1)/600)
-        runtime = time.perf_counter() - t
+            bqm, time_limit=TIME_LIMIT_DATETIME)
+        runtime_ns = time.perf_counter_ns() - t
 
-        self.assertTrue(.05 < runtime < .15)
+        self.assertTrue(50_000_000 < runtime_ns < 150_000_000)
 
     def test_time_limit_quality(self):
         # get a linear BQM
-        bqm = dimod.BQM('BINARY')
-        for v in range(32):
-            bqm.set_linear(v, 1 << v)
+        bqm = dimod.BQM({v: 1 << v for v in range(32)}, {}, 0, 'BINARY')
 
         max_num_samples = 100
         # pick a time limit that should produce many more draws than reads
         sampleset = RandomSampler().sample(bqm, max_num_samples=max_num_samples,
                                            time_limit=.01)
         num_drawn = sampleset.info['num_reads']
+        energies = sampleset.record.energy
 
         # solutions should all be in range [0, (2 << 32) * (max_num_samples / num_draws)]
-        self.assertTrue(
-            (sampleset.record.energy < (2 << 32) * (max_num_samples / num_drawn) * 1.25).all())
+        threshold = (2 << 32) * (max_num_samples / num_drawn) * 1.25
+        self.assertTrue((energies < threshold).all())
@@ -12,6 +12,7 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 
+import os
 import time
 import unittest
 import contextlib
@@ -39,7 +40,7 @@ def tictoc(*args, **kwargs):
 
     """
 
-    class Timer(object):
+    class Timer:
         _start = _end = None
 
         def start(self):
@@ -65,37 +66,40 @@ def tictoc(*args, **kwargs):
 
 
 def cpu_count():
-    try:
-        import os
-        # doesn't exist in python2, and can return None
-        return os.cpu_count() or 1
-    except AttributeError:
-        pass
-
-    try:
-        import multiprocessing
-        # doesn't have to be implemented
-        return multiprocessing.cpu_count()
-    except NotImplementedError:
-        pass
-
-    return 1
+    # can return None if undetermined
+    return os.cpu_count() or 1
 
 
 class TestSA(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # FM problems, keyed by (num_variables, num_samples, num_sweeps)
+        cls._fm_problems = {}
+
     def _sample_fm_problem(self, num_variables=10, num_samples=100, num_sweeps=1000):
+        key = (num_variables, num_samples, num_sweeps)
+        if key not in self._fm_problems:
+            self._fm_problems[key] = self._build_fm_problem(*key)
+
+        # all problem parts are shared, except for the initial states, which
+        # are annealed in place and hence copied for every run
+        problem = self._fm_problems[key]
+        return problem[:-1] + (np.copy(problem[-1]), )
+
+    @staticmethod
+    def _build_fm_problem(num_variables, num_samples, num_sweeps):
         h = [-1]*num_variables
-        (coupler_starts,
-            coupler_ends,
-            coupler_weights) = zip(*((u, v, -1) for u in range(num_variables)
-                                   for v in range(u, num_variables)))
+        coupler_starts, coupler_ends = np.triu_indices(num_variables)
+        coupler_weights = np.full(coupler_starts.size, -1, dtype=np.float64)
 
         beta_schedule = np.linspace(0.01, 3, num=num_sweeps)
         sweeps_at_beta = 1
         seed = 1
 
         np_rand = np.random.RandomState(1234)
-        initial_states = 2*np_rand.randint(2, size=(num_samples, num_variables)).astype(np.int8) - 1
+        initial_states = np_rand.randint(2, size=(num_samples, num_variables), dtype=np.int8)
+        initial_states *= 2
+        initial_states -= 1
 
         return (num_samples, h, coupler_starts, coupler_ends, coupler_weights,
                 sweeps_at_beta, beta_schedule, seed, initial_states)
@@ -118,7 +122,7 @@ class TestSA(unittest.TestCase):
         self.assertTrue(samples.shape == (num_samples, num_variables),
                         "Sampler returned wrong shape for samples")
         # make sure samples contain only +-1
-        self.assertTrue(set(np.unique(samples)).issubset({-1, 1}),
+        self.assertTrue(np.all((samples == 1) | (samples == -1)),
                         "Sampler returned spins with values not equal to +-1")
 
         # ensure energies is valid
@@ -150,37 +154,42 @@ class TestSA(unittest.TestCase):
         # problem = self._sample_fm_problem(num_variables=40, num_samples=1000, num_sweeps=10)
         num_variables, num_sweeps, num_samples = 100, 10, 1000
         h = [0]*num_variables
-        (coupler_starts,
-         coupler_ends,
-         coupler_weights) = zip(*((u, v, 1) for u in range(num_variables)
-                                  for v in range(u, num_variables)))
+        coupler_starts, coupler_ends = np.triu_indices(num_variables)
+        coupler_weights = np.ones(coupler_starts.size, dtype=np.float64)
 
         beta_schedule = np.linspace(0.3, 0.4, num=num_sweeps)
         sweeps_at_beta = 1
 
-        np_rand = np.random.RandomState(1234)
-        initial_states = np_rand.randint(1, size=(num_samples, num_variables))
-        initial_states = 2*initial_states.astype(np.int8) - 1
+        initial_states = np.full((num_samples, num_variables), -1, dtype=np.int8)
 
-        previous_samples = []
-        for seed in (1, 40, 235, 152436, 3462354, 92352355):
+        # states are annealed in place (and samples returned are views of
+        # them), so reset two reusable buffers before each run
+        buf0 = np.empty_like(initial_states)
+        buf1 = np.empty_like(initial_states)
+
+        seeds = (1, 40, 235, 152436, 3462354, 92352355)
+        previous_samples = np.empty((len(seeds), num_samples, num_variables),
+                                    dtype=np.int8)
+        for i, seed in enumerate(seeds):
+            np.copyto(buf0, initial_states)
             samples0, _ = simulated_annealing(num_samples, h, coupler_starts,
                                               coupler_ends, coupler_weights,
                                               sweeps_at_beta, beta_schedule,
-                                              seed, np.copy(initial_states))
+                                              seed, buf0)
+            np.copyto(buf1, initial_states)
             samples1, _ = simulated_annealing(num_samples, h, coupler_starts,
                                               coupler_ends, coupler_weights,
                                               sweeps_at_beta, beta_schedule,
-                                              seed, np.copy(initial_states))
+                                              seed, buf1)
 
             self.assertTrue(np.array_equal(samples0, samples1),
                             "Same seed returned different results")
 
-            for previous_sample in previous_samples:
-                self.assertFalse(np.array_equal(samples0, previous_sample),
-                                 "Different seed returned same results")
+            self.assertFalse(
+                (previous_samples[:i] == samples0).all(axis=(1, 2)).any(),
+                "Different seed returned same results")
 
-            previous_samples.append(samples0)
+            previous_samples[i] = samples0
 
     def test_immediate_interrupt(self):
         num_variables = 5
@@ -213,18 +222,14 @@ class TestSA(unittest.TestCase):
     def test_initial_states(self):
         num_variables, num_sweeps, num_samples = 100, 0, 1000
         h = [0]*num_variables
-        (coupler_starts,
-         coupler_ends,
-         coupler_weights) = zip(*((u, v, 1) for u in range(num_variables)
-                                  for v in range(u, num_variables)))
+        coupler_starts, coupler_ends = np.triu_indices(num_variables)
+        coupler_weights = np.ones(coupler_starts.size, dtype=np.float64)
 
         beta_schedule = np.linspace(0.3, 0.4, num=num_sweeps)
         sweeps_at_beta = 1
         seed = 1234567890
 
-        np_rand = np.random.RandomState(1234)
-        initial_states = np_rand.randint(1, size=(num_samples, num_variables))
-        initial_states = 2*initial_states.astype(np.int8) - 1
+        initial_states = np.full((num_samples, num_variables), -1, dtype=np.int8)
 
         samples, _ = simulated_annealing(num_samples, h, coupler_starts,
                                          coupler_ends, coupler_weights,
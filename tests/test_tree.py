@@ -18,6 +18,7 @@ import unittest
 import dimod
 import networkx as nx
 import numpy as np
+from parameterized import parameterized
 
 from dwave.samplers.tree.solve import solve_bqm_wrapper
 from dwave.samplers.tree.sample import sample_bqm_wrapper
@@ -95,8 +96,7 @@ class TestTreewidth(unittest.TestCase):
 
     def test_cycle(self):
         bqm = dimod.BQM('BINARY')
-        for v in range(43):
-            bqm.add_quadratic(v, (v + 1) % 43, 1)
+        bqm.add_quadratic_from((v, (v + 1) % 43, 1) for v in range(43))
 
         tw, order = min_fill_heuristic(bqm)
         self.assertEqual(tw, 2)
@@ -151,25 +151,12 @@ class TestTreewidth(unittest.TestCase):
 
         with self.subTest(n=5):
             bqm = dimod.BQM('BINARY')
-            for v in range(4):
-                bqm.add_quadratic(v, v+1, 1)
+            bqm.add_quadratic_from((v, v+1, 1) for v in range(4))
             tw, order = min_fill_heuristic(bqm)
             self.assertEqual(tw, 1)
             self.assertIn(order[0], [0, 4])  # starts at one of the ends
             self.check_order(bqm, tw, order)
 
-        # all possible variable orderings for a 5path
-        for combo in itertools.permutations(range(5)):
-            with self.subTest(path=combo):
-                bqm = dimod.BQM('BINARY')
-                bqm.add_variables_from((v, 0) for v in combo)
-                for v in range(4):
-                    bqm.add_quadratic(v, v+1, 0)
-                tw, order = min_fill_heuristic(bqm)
-                self.assertEqual(tw, 1)
-                self.assertIn(order[0], [0, 4])  # starts at one of the ends
-                self.check_order(bqm, tw, order)
-
         with self.subTest(path='edbde'):
             bqm = dimod.BQM('BINARY')
             bqm.add_variables_from((v, 0) for v in 'edbca')
@@ -178,3 +165,14 @@ class TestTreewidth(unittest.TestCase):
             self.assertEqual(tw, 1)
 
             self.check_order(bqm, tw, order)
+
+    @parameterized.expand([(combo, ) for combo in itertools.permutations(range(5))])
+    def test_path_orderings(self, combo):
+        """All possible variable orderings for a 5path."""
+        bqm = dimod.BQM('BINARY')
+        bqm.add_variables_from((v, 0) for v in combo)
+        bqm.add_quadratic_from((v, v+1, 0) for v in range(4))
+        tw, order = min_fill_heuristic(bqm)
+        self.assertEqual(tw, 1)
+        self.assertIn(order[0], [0, 4])  # starts at one of the ends
+        self.check_order(bqm, tw, order)
@@ -12,7 +12,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import collections
 import inspect
 import itertools
 import unittest
@@ -39,16 +38,20 @@ class TestConstruction(unittest.TestCase):
 
 @dimod.testing.load_sampler_bqm_tests(TreeDecompositionSampler())
 class TestSample(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.sampler = TreeDecompositionSampler()
+
     def test_empty(self):
         bqm = dimod.BinaryQuadraticModel.empty(dimod.SPIN)
 
-        sampleset = TreeDecompositionSampler().sample(bqm)
+        sampleset = self.sampler.sample(bqm)
         dimod.testing.assert_response_energies(sampleset, bqm)
 
     def test_empty_num_reads(self):
         bqm = dimod.BinaryQuadraticModel.empty(dimod.SPIN)
 
-        sampleset = TreeDecompositionSampler().sample(bqm, num_reads=10)
+        sampleset = self.sampler.sample(bqm, num_reads=10)
         self.assertEqual(len(sampleset), 10)
         dimod.testing.assert_response_energies(sampleset, bqm)
 
@@ -56,8 +59,8 @@ class TestSample(unittest.TestCase):
         bqm_empty = dimod.BinaryQuadraticModel.empty(dimod.BINARY)
         bqm = dimod.BinaryQuadraticModel.from_qubo({(0, 0): -1, (0, 1): 1})
 
-        sampleset_empty = TreeDecompositionSampler().sample(bqm_empty)
-        sampleset = TreeDecompositionSampler().sample(bqm)
+        sampleset_empty = self.sampler.sample(bqm_empty)
+        sampleset = self.sampler.sample(bqm)
 
         self.assertEqual(sampleset_empty.record.sample.dtype,
                          sampleset.record.sample.dtype)
@@ -68,8 +71,8 @@ class TestSample(unittest.TestCase):
         bqm_empty = dimod.BinaryQuadraticModel.empty(dimod.BINARY)
         bqm = dimod.BinaryQuadraticModel.from_qubo({(0, 0): -1, (0, 1): 1})
 
-        sampleset_empty = TreeDecompositionSampler().sample(bqm_empty)
-        sampleset = TreeDecompositionSampler().sample(bqm)
+        sampleset_empty = self.sampler.sample(bqm_empty)
+        sampleset = self.sampler.sample(bqm)
 
         self.assertEqual(set(sampleset.info), set(sampleset_empty.info))
 
@@ -77,15 +80,15 @@ class TestSample(unittest.TestCase):
         bqm_empty = dimod.BinaryQuadraticModel.empty(dimod.BINARY)
         bqm = dimod.BinaryQuadraticModel.from_qubo({(0, 0): -1, (0, 1): 1})
 
-        sampleset_empty = TreeDecompositionSampler().sample(bqm_empty, marginals=True)
-        sampleset = TreeDecompositionSampler().sample(bqm, marginals=True)
+        sampleset_empty = self.sampler.sample(bqm_empty, marginals=True)
+        sampleset = self.sampler.sample(bqm, marginals=True)
 
         self.assertEqual(set(sampleset.info), set(sampleset_empty.info))
 
     def test_single_variable(self):
         bqm = dimod.BinaryQuadraticModel.from_ising({'a': -1}, {})
 
-        samples = TreeDecompositionSampler().sample(bqm, num_reads=1)
+        samples = self.sampler.sample(bqm, num_reads=1)
 
         self.assertEqual(len(samples), 1)
         dimod.testing.assert_response_energies(samples, bqm)
@@ -93,7 +96,7 @@ class TestSample(unittest.TestCase):
     def test_single_interaction(self):
         bqm = dimod.BinaryQuadraticModel.from_ising({'a': -1}, {'ab': 1})
 
-        samples = TreeDecompositionSampler().sample(bqm, num_reads=1)
+        samples = self.sampler.sample(bqm, num_reads=1)
 
         self.assertEqual(len(samples), 1)
         dimod.testing.assert_response_energies(samples, bqm)
@@ -101,175 +104,177 @@ class TestSample(unittest.TestCase):
     def test_larger_problem(self):
         bqm = dimod.BinaryQuadraticModel.from_ising({'a': -1}, {'ab': 1, 'bc': -1, 'cd': +1})
 
-        samples = TreeDecompositionSampler().sample(bqm, num_reads=1)
+        samples = self.sampler.sample(bqm, num_reads=1)
 
         self.assertEqual(len(samples), 1)
         dimod.testing.assert_response_energies(samples, bqm)
 
 
 class TestMarginals:
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        cls.sampler = TreeDecompositionSampler()
+
+        # use the exactsolver to get all of the samples/energies, shared by
+        # all of the analytic checks
+        cls.exact = dimod.ExactSolver().sample(cls.bqm)
+
     def test_spin_log_partition_function(self):
         bqm = self.bqm
 
-        exact = dimod.ExactSolver().sample(bqm)
+        exact = self.exact
 
-        # dev note: when migrating to python 3.4+ these should become subtests
-        for beta in [.5, 1., 1.5, 2]:
-            sampleset = TreeDecompositionSampler().sample(bqm,
-                                              marginals=True, num_reads=10,
-                                              beta=beta)
+        betas = np.array([.5, 1., 1.5, 2])
+
+        # compute log Z for every beta at once from the exact energies. Work in
+        # log space, as exp(-beta*E) and Z overflow for large |beta*E|
+        calculated_logZs = np.logaddexp.reduce(
+            -betas[:, np.newaxis]*exact.record.energy, axis=1)
 
-            logZ = sampleset.info['log_partition_function']
+        for beta, calculated_logZ in zip(betas, calculated_logZs):
+            with self.subTest(beta=beta):
+                sampleset = self.sampler.sample(bqm,
+                                                marginals=True, num_reads=10,
+                                                beta=beta)
 
-            # use the exactsolver to get all of the samples/energies
-            calculated_logZ = np.log(np.sum(np.exp(-beta*exact.record.energy)))
+                logZ = sampleset.info['log_partition_function']
 
-            self.assertAlmostEqual(logZ, calculated_logZ,
-                                   msg='beta={}'.format(beta))
+                self.assertAlmostEqual(logZ, calculated_logZ)
 
     def test_variable_marginals_analytic(self):
         bqm = self.bqm
 
-        exact = dimod.ExactSolver().sample(bqm)
-
-        # for each variable, we need the sum over all energies when variable
-        # is low or high
-        energies = {}
-        for v in bqm.variables:
-            idx = exact.variables.index(v)
+        exact = self.exact
 
-            hien = exact.record[exact.record.sample[:, idx] > 0].energy
+        # for each variable, a sample contributes to its marginal when the
+        # variable is high
+        high = exact.record.sample > 0
 
-            energies[v] = hien
-
-        # dev note: when migrating to python 3.4+ these should become subtests
         for beta in [.5, 1., 1.5, 2]:
-            sampleset = TreeDecompositionSampler().sample(bqm,
-                                              marginals=True, num_reads=1,
-                                              beta=beta)
-
-            logZ = sampleset.info['log_partition_function']
-            variable_marginals = sampleset.info['variable_marginals']
+            with self.subTest(beta=beta):
+                sampleset = self.sampler.sample(bqm,
+                                                marginals=True, num_reads=1,
+                                                beta=beta)
 
-            Z = np.exp(logZ)  # we're only doing small ones so this is ok
+                logZ = sampleset.info['log_partition_function']
+                variable_marginals = sampleset.info['variable_marginals']
 
-            for v, p in variable_marginals.items():
-                hien = energies[v]  # energies associated with v > 0
+                # sum the probabilities of all the samples for every variable
+                # at once
+                probabilities = np.exp(-beta*exact.record.energy - logZ)
+                analytic_marginals = probabilities @ high
 
-                self.assertAlmostEqual(p, np.sum(np.exp(-beta*hien)) / Z)
+                for v, p in variable_marginals.items():
+                    self.assertAlmostEqual(
+                        p, analytic_marginals[exact.variables.index(v)])
 
     def test_variable_marginals_empirical(self):
         # check that the actual samples match the marginals
         bqm = self.bqm
 
-        # dev note: when migrating to python 3.4+ these should become subtests
         for beta in [.5, 1., 1.5, 2]:
-            # we only need one sample to get the marginals
-            single_sample = TreeDecompositionSampler().sample(bqm,
-                                                  marginals=True, num_reads=1,
-                                                  beta=beta)
+            with self.subTest(beta=beta):
+                n = 22500
 
-            variable_marginals = single_sample.info['variable_marginals']
+                # the marginals do not depend on the number of reads, so take
+                # them from the same call as the samples
+                sampleset = self.sampler.sample(bqm, marginals=True, num_reads=n,
+                                                beta=beta)
 
-            n = 22500
+                variable_marginals = sampleset.info['variable_marginals']
 
-            sampleset = TreeDecompositionSampler().sample(bqm, marginals=True, num_reads=n,
-                                              beta=beta)
+                # observed frequency of the high state, for all variables at once
+                p_observed = np.count_nonzero(sampleset.record.sample > 0, axis=0) / n
 
-            for v, p in variable_marginals.items():
-                p_observed = np.sum(sampleset.samples()[:, v] > 0) / len(sampleset)
-
-                self.assertAlmostEqual(p, p_observed, places=1)
+                for v, p in variable_marginals.items():
+                    self.assertAlmostEqual(
+                        p, p_observed[sampleset.variables.index(v)], places=1)
 
     def test_interaction_marginals_analytic(self):
         bqm = self.bqm
 
-        exact = dimod.ExactSolver().sample(bqm)
+        exact = self.exact
+        samples = exact.record.sample
 
         for beta in [.5, 1., 1.5, 2]:
-            sampleset = TreeDecompositionSampler().sample(self.bqm, num_reads=1, beta=beta,
-                                              marginals=True)
-
-            logZ = sampleset.info['log_partition_function']
-            interaction_marginals = sampleset.info['interaction_marginals']
-
-            Z = np.exp(logZ)  # we're only doing small ones so this is ok
-
-            total_p = 0  # for sanity check
-
-            # calculate the marginals analytically from the energies
-            analytic_marginals = {pair: collections.defaultdict(float)
-                                  for pair in interaction_marginals}
-            for sample, energy in exact.data(['sample', 'energy']):
+            with self.subTest(beta=beta):
+                sampleset = self.sampler.sample(bqm, num_reads=1, beta=beta,
+                                                marginals=True)
 
-                # probability for this sample
-                p = np.sum(np.exp(-beta*energy)) / Z
-                total_p += p
+                logZ = sampleset.info['log_partition_function']
+                interaction_marginals = sampleset.info['interaction_marginals']
 
-                for (u, v) in analytic_marginals:
-                    config = (sample[u], sample[v])
+                probabilities = np.exp(-beta*exact.record.energy - logZ)
 
-                    analytic_marginals[(u, v)][config] += p
+                self.assertAlmostEqual(probabilities.sum(), 1)  # sanity check
 
-            self.assertAlmostEqual(total_p, 1)  # sanity check
+                # calculate the marginals analytically by masking the samples
+                # matrix, and check that analytic and orang's are the same
+                for (u, v), combos in interaction_marginals.items():
+                    ucol = samples[:, exact.variables.index(u)]
+                    vcol = samples[:, exact.variables.index(v)]
 
-            # check that analytic and orang's are the same
-            for pair, combos in interaction_marginals.items():
-                for config, p in combos.items():
-                    self.assertAlmostEqual(p, analytic_marginals[pair][config])
+                    for (uval, vval), p in combos.items():
+                        mask = (ucol == uval) & (vcol == vval)
+                        self.assertAlmostEqual(p, probabilities[mask].sum())
 
 
-class TestSingleVariableSPIN(unittest.TestCase, TestMarginals):
+class TestSingleVariableSPIN(TestMarginals, unittest.TestCase):
     bqm = dimod.BinaryQuadraticModel.from_ising({'a': -1}, {})
 
 
-class TestSingleVariableSPIN2(unittest.TestCase, TestMarginals):
+class TestSingleVariableSPIN2(TestMarginals, unittest.TestCase):
     bqm = dimod.BinaryQuadraticModel.from_ising({'a': 1}, {})
 
 
-class TestSingleVariableBINARY(unittest.TestCase, TestMarginals):
+class TestSingleVariableBINARY(TestMarginals, unittest.TestCase):
     bqm = dimod.BinaryQuadraticModel.from_qubo({(0, 0): -1})
 
 
-class TestSingleVariableBINARY(unittest.TestCase, TestMarginals):
+class TestSingleVariableBINARY2(TestMarginals, unittest.TestCase):
     bqm = dimod.BinaryQuadraticModel.from_qubo({(0, 0): 1})
 
 
-class TestSingleVariableWithOffsetSPIN(unittest.TestCase, TestMarginals):
+class TestSingleVariableWithOffsetSPIN(TestMarginals, unittest.TestCase):
     bqm = dimod.BinaryQuadraticModel.from_ising({'a': -1}, {}, .5)
 
 
-class TestSingleVariableWithOffsetBINARY(unittest.TestCase, TestMarginals):
+class TestSingleVariableWithOffsetBINARY(TestMarginals, unittest.TestCase):
     bqm = dimod.BinaryQuadraticModel.from_qubo({(0, 0): -1}, offset=.5)
 
 
-class TestSingleInteractionSPIN(unittest.TestCase, TestMarginals):
+class TestSingleInteractionSPIN(TestMarginals, unittest.TestCase):
     bqm = dimod.BinaryQuadraticModel.from_ising({}, {'ab': -1})
 
 
-class TestSingleInteractionSPIN2(unittest.TestCase, TestMarginals):
+class TestSingleInteractionSPIN2(TestMarginals, unittest.TestCase):
     bqm = dimod.BinaryQuadraticModel.from_ising({}, {'ab': 1})
 
 
-class TestK3SPIN(unittest.TestCase, TestMarginals):
+class TestK3SPIN(TestMarginals, unittest.TestCase):
     bqm = dimod.BinaryQuadraticModel.from_ising({}, {'ab': .69, 'bc': 1, 'ac': .5})
 
 
-class TestK3BINARY(unittest.TestCase, TestMarginals):
+class TestK3BINARY(TestMarginals, unittest.TestCase):
     bqm = dimod.BinaryQuadraticModel.from_qubo({'ab': .69, 'bc': 1, 'ac': .5})
 
 
-class Test3pathBINARY(unittest.TestCase, TestMarginals):
+class Test3pathBINARY(TestMarginals, unittest.TestCase):
     bqm = dimod.BinaryQuadraticModel.from_qubo({'ab': .69, 'bc': 1})
 
 
-class TestLongerPath(unittest.TestCase, TestMarginals):
+class TestLongerPath(TestMarginals, unittest.TestCase):
     g = nx.path_graph(10)
-    linear = {node: np.random.randint(-20,20) for node in g.nodes}
-    quadratic = {edge: np.random.randint(-20,20) for edge in g.edges}
-    bqm = dimod.BinaryQuadraticModel(linear, quadratic, "BINARY")
+    # draw all biases at once from a dedicated, seeded stream so the problem
+    # does not depend on global RNG state or test ordering
+    rng = np.random.default_rng(1234)
+    linear = rng.integers(-20, 20, size=len(g.nodes))
+    quadratic = (*np.array(list(g.edges)).T, rng.integers(-20, 20, size=len(g.edges)))
+    bqm = dimod.BinaryQuadraticModel.from_numpy_vectors(linear, quadratic, 0, "BINARY")
 
 
-class TestDictBQM(unittest.TestCase, TestMarginals):
+class TestDictBQM(TestMarginals, unittest.TestCase):
     bqm = dimod.AdjDictBQM({'a': 6.0, 0: 1}, {('a', 0): -3, (0, 'c'): 10}, 0, 'BINARY')
 
@@ -17,9 +17,18 @@ import itertools
 import unittest
 
 import dimod
+import numpy as np
 
 from dwave.samplers.tree import TreeDecompositionSolver
 
+# problems shared by the tests, built once on import. The tests must not
+# mutate them
+CHAIN100 = dimod.BinaryQuadraticModel.from_ising(
+    {}, {(v, v+1): -1 for v in range(99)})
+_irow, _icol = np.triu_indices(20, k=1)
+CLIQUE20 = dimod.BinaryQuadraticModel.from_numpy_vectors(
+    np.zeros(20), (_irow, _icol, np.full(_irow.size, -1.)), 0, dimod.BINARY)
+
 
 class TestConstruction(unittest.TestCase):
     def test_construction(self):
@@ -89,34 +98,43 @@ class TestSample(unittest.TestCase):
         dimod.testing.assert_response_energies(samples, bqm)
 
     def test_chain(self):
+        for vartype in [dimod.SPIN, dimod.BINARY]:
+            with self.subTest(vartype=vartype.name):
+                # conversion preserves the energy of every state
+                bqm = CHAIN100.change_vartype(vartype, inplace=False)
 
-        bqm = dimod.BinaryQuadraticModel.from_ising({}, {(v, v+1): -1 for v in range(99)})
+                samples = TreeDecompositionSolver().sample(bqm, num_reads=3)
+                dimod.testing.assert_response_energies(samples, bqm)
 
-        samples = TreeDecompositionSolver().sample(bqm, num_reads=3)
-        dimod.testing.assert_response_energies(samples, bqm)
+                self.assertEqual(len(samples), 3)
 
-        self.assertEqual(len(samples), 3)
-        ground0, ground1, excited = samples.samples()
+                # work on the rows of the samples array, rather than building
+                # a labelled sample per row
+                ground0, ground1, excited = samples.record.sample
 
-        # the two ground states should be all -1 or all 1
-        self.assertEqual(len(set(ground0.values())), 1)
-        self.assertEqual(len(set(ground1.values())), 1)
-        self.assertEqual(set(ground1.values()).union(ground0.values()), {-1, 1})
+                # the two ground states should be all low or all high
+                self.assertEqual(len(set(ground0.tolist())), 1)
+                self.assertEqual(len(set(ground1.tolist())), 1)
+                self.assertEqual(set(ground1.tolist()).union(ground0.tolist()),
+                                 vartype.value)
 
-        # first excited should have one frustrated edge
-        self.assertEqual(sum(excited[u] != excited[v] for u, v in bqm.quadratic), 1)
+                # first excited should have one frustrated edge, compare the
+                # endpoints of all the edges at once (in the sampleset's
+                # column order)
+                _, (irow, icol, _), _ = bqm.to_numpy_vectors(samples.variables)
+                self.assertEqual(np.count_nonzero(excited[irow] != excited[icol]), 1)
 
     def test_clique(self):
-        bqm = dimod.BinaryQuadraticModel.from_qubo({pair: -1 for pair in itertools.combinations(range(20), 2)})
+        bqm = CLIQUE20
 
         samples = TreeDecompositionSolver().sample(bqm, num_reads=2)
         dimod.testing.assert_response_energies(samples, bqm)
 
         self.assertEqual(len(samples), 2)
-        ground, excited = samples.samples()
+        ground, excited = samples.record.sample
 
-        self.assertEqual(set(ground.values()), {1})
-        self.assertEqual(sum(excited.values()), len(excited) - 1)
+        self.assertEqual(set(ground.tolist()), {1})
+        self.assertEqual(excited.sum(), len(excited) - 1)
 
     def test_offset(self):
         bqm = dimod.BinaryQuadraticModel.from_qubo({pair: -1 for pair in itertools.combinations(range(4), 2)})